@@ -1,19 +1,22 @@
-import re
-import time
-from collections import OrderedDict
 from pathlib import Path
 
 from mkdocs.config import config_options
 from mkdocs.plugins import BasePlugin
-from pybtex.database import BibliographyData, parse_file
+from pybtex.database import BibliographyData
 
 from mkdocs_bibtex.utils import (
+    CACHE_VERSION,
+    entry_fingerprint,
     find_cite_blocks,
     extract_cite_keys,
+    find_bib_files,
     format_bibliography,
     format_simple,
     insert_citation_keys,
-    log
+    log,
+    parse_bib_files,
+    read_pickle_cache,
+    write_pickle_cache,
 )
 
 
@@ -36,6 +39,10 @@ class BibTeXPlugin(BasePlugin):
             references. Defaults to "\\full_bibliography".
         footnote_format (str): Format string for citation footnotes. Must include
             "{number}" placeholder. Defaults to "{number}".
+        cache_dir (str): Directory for caching parsed BibTeX files and formatted
+            references across builds.
+            Relative paths resolve from the directory containing mkdocs.yml.
+            Caching is disabled when unset.
 
     Note:
         `bib_dir` is required.
@@ -47,12 +54,19 @@ class BibTeXPlugin(BasePlugin):
         ("bib_by_default", config_options.Type(bool, default=True)),
         ("full_bib_command", config_options.Type(str, default="\\full_bibliography")),
         ("footnote_format", config_options.Type(str, default="{number}")),
+        ("cache_dir", config_options.Optional(config_options.Type(str))),
     ]
 
     def __init__(self):
         self.bib_data = None
-        self.all_references = OrderedDict()
+        self.bib_file_entries = {}
+        self.all_references = {}
+        self.full_bib_cache = None
         self.warned_missing_keys = set()
+        self.page_cache = {}
+        self.bib_mtimes = None
+        self.cache_dir = None
+        self.preformatted = {}
 
     def on_startup(self, *, command, dirty):
         """
@@ -83,7 +97,6 @@ class BibTeXPlugin(BasePlugin):
                 footnote_format doesn't contain the required "{number}" placeholder.
         """
 
-        bibfiles = []
         self.warned_missing_keys = set()
 
         config_file_path = getattr(config, "config_file_path", None)
@@ -95,38 +108,55 @@ class BibTeXPlugin(BasePlugin):
             bib_dir = Path(self.config["bib_dir"])
             if not bib_dir.is_absolute():
                 bib_dir = (base_dir / bib_dir).resolve()
-            bibfiles.extend(bib_dir.rglob("*.bib"))
+            bib_mtimes = find_bib_files(bib_dir)
         else:  # pragma: no cover
             raise Exception("Must supply a directory for bibtex files via `bib_dir`")
 
-        # load bibliography data
+        cache_dir = self.config.get("cache_dir", None)
+        if cache_dir is not None:
+            cache_dir = Path(cache_dir)
+            if not cache_dir.is_absolute():
+                cache_dir = (base_dir / cache_dir).resolve()
+        if cache_dir is not None and cache_dir != self.cache_dir:
+            record = read_pickle_cache(cache_dir / "references.pkl")
+            if isinstance(record, tuple) and len(record) == 2 and record[0] == CACHE_VERSION:
+                self.preformatted.update(record[1])
+        self.cache_dir = cache_dir
+
+        # Skip rebuilding bib data if no file was added, removed or modified
+        if bib_mtimes == self.bib_mtimes:
+            # log.info("BibTeXPlugin: no changes in bibfiles")
+            return config
+
+        # load bibliography data, re-parsing only files added or modified since the last load
+        previous_mtimes = self.bib_mtimes or {}
+        changed = [path for path, mtime in bib_mtimes.items() if previous_mtimes.get(path) != mtime]
+        # log.info(f"BibTeXPlugin: loading data from bib files: {changed}")
+        self.bib_file_entries = {
+            path: self.bib_file_entries[path]
+            for path, mtime in bib_mtimes.items()
+            if previous_mtimes.get(path) == mtime
+        }
+        self.bib_file_entries.update(parse_bib_files(changed, cache_dir=cache_dir))
+
         refs = {}
-        # log.info(f"BibTeXPlugin: loading data from bib files: {bibfiles}")
-        for bibfile in bibfiles:
-            log.debug(f"Parsing bibtex file {bibfile}")
-            bibdata = parse_file(bibfile)
-            refs.update(bibdata.entries)
-
-        if hasattr(self, "last_configured"):
-            # Skip rebuilding bib data if all files are older than the initial config
-            if all(
-                Path(bibfile).stat().st_mtime < self.last_configured
-                for bibfile in bibfiles
-            ):
-                # log.info("BibTeXPlugin: no changes in bibfiles")
-                return config
-
-        # Clear references on reconfig
-        self.all_references = OrderedDict()
+        for path in bib_mtimes:
+            refs.update(self.bib_file_entries[path])
 
         self.bib_data = BibliographyData(entries=refs)
 
+        # Restart numbering as a fresh build would; unchanged entries are not
+        # formatted again since their text is kept in `preformatted`
+        self.all_references = {}
+        self.full_bib_cache = None
+        self.page_cache = {}
+
         if "{number}" not in self.config.get("footnote_format", "{number}"):
             raise Exception("Must include `{number}` placeholder in footnote_format")
 
         self.footnote_format = self.config.get("footnote_format")
 
-        self.last_configured = time.time()
+        self.bib_mtimes = bib_mtimes
         return config
 
     def on_page_markdown(self, markdown, page, config, files):
@@ -150,6 +180,38 @@ class BibTeXPlugin(BasePlugin):
             str: The processed markdown content with citations and bibliographies inserted.
         """
 
+        bib_command = self.config.get("bib_command", "\\bibliography")
+        full_bib_command = self.config.get("full_bib_command", "\\full_bibliography")
+
+        # Pages without citations or bibliography commands have nothing to render
+        if (
+            "\\cite" not in markdown
+            and bib_command not in markdown
+            and full_bib_command not in markdown
+        ):
+            return markdown
+
+        # Pages are cached by source path while the bib data is unchanged. The
+        # full bibliography depends on every other page, so it is never cached.
+        src_path = getattr(getattr(page, "file", None), "src_path", None)
+        page_options = (
+            bib_command,
+            full_bib_command,
+            self.config.get("bib_by_default"),
+            self.footnote_format,
+        )
+        cacheable = src_path is not None and full_bib_command not in markdown
+        if cacheable and src_path in self.page_cache:
+            cached_markdown, cached_options, cite_keys, rendered = self.page_cache[src_path]
+            if cached_markdown == markdown and cached_options == page_options:
+                # Replay missing-key warnings so they are still logged once per build
+                self.warn_missing_keys(
+                    key for cite_block in cite_keys for key in extract_cite_keys(cite_block)
+                )
+                return rendered
+
+        source_markdown = markdown
+
         # 1. Grab all the cited keys in the markdown
         cite_keys = find_cite_blocks(markdown)
 
@@ -160,29 +222,41 @@ class BibTeXPlugin(BasePlugin):
         markdown = insert_citation_keys(citation_quads, markdown)
 
         # 4. Insert in the bibliography text into the markdown
-        bib_command = self.config.get("bib_command", "\\bibliography")
-
         if self.config.get("bib_by_default"):
             markdown += f"\n{bib_command}"
 
-        bibliography = format_bibliography(citation_quads)
-        markdown = re.sub(
-            re.escape(bib_command),
-            bibliography,
-            markdown,
-        )
+        if bib_command in markdown:
+            bibliography = format_bibliography(citation_quads)
+            markdown = markdown.replace(bib_command, bibliography)
 
         # 5. Build the full Bibliography and insert into the text
-        full_bib_command = self.config.get("full_bib_command", "\\full_bibliography")
+        if full_bib_command in markdown:
+            markdown = markdown.replace(full_bib_command, self.full_bibliography)
 
-        markdown = re.sub(
-            re.escape(full_bib_command),
-            self.full_bibliography,
-            markdown,
-        )
+        if cacheable:
+            self.page_cache[src_path] = (source_markdown, page_options, cite_keys, markdown)
 
         return markdown
 
+    def on_post_build(self, config):
+        """
+        Save the formatted references used in this build to the cache directory.
+
+        Only references still registered in `all_references` are written, so
+        text for edited or removed entries does not accumulate in the cache.
+
+        Args:
+            config: The MkDocs configuration object.
+        """
+        if self.cache_dir is None:
+            return
+
+        references = {
+            entry_fingerprint(self.bib_data.entries[key]): citation
+            for key, citation in self.all_references.items()
+        }
+        write_pickle_cache(self.cache_dir / "references.pkl", (CACHE_VERSION, references))
+
     def format_footnote_key(self, number):
         """
         Generate a formatted footnote key based on the configured format.
@@ -217,60 +291,75 @@ class BibTeXPlugin(BasePlugin):
         """
 
         # 1. Extract the keys from the keyset
-        entries = OrderedDict()
+        entries = {}
+        # Repeated blocks yield the same pairs, so each distinct block is parsed once
         pairs = [
             [cite_block, key]
-            for cite_block in cite_keys
+            for cite_block in dict.fromkeys(cite_keys)
             for key in extract_cite_keys(cite_block)
         ]
 
-        for key in OrderedDict.fromkeys([k for _, k in pairs]).keys():
-            if key in self.bib_data.entries:
-                continue
-            if key in self.warned_missing_keys:
-                continue
-            log.warning(f"Citation key '{key}' not found in bibliography data")
-            self.warned_missing_keys.add(key)
+        self.warn_missing_keys(k for _, k in pairs)
 
         # Remove non-existant keys from pairs
         pairs = [p for p in pairs if p[1] in self.bib_data.entries]
-        keys = list(OrderedDict.fromkeys([k for _, k in pairs]).keys())
-        numbers = {k: str(n + 1) for n, k in enumerate(keys)}
+        keys = list(dict.fromkeys(k for _, k in pairs))
+        footnotes = {k: self.format_footnote_key(str(n + 1)) for n, k in enumerate(keys)}
 
         # 2. Collect any unformatted reference keys
-        for _, key in pairs:
+        for key in keys:
             if key not in self.all_references:
                 entries[key] = self.bib_data.entries[key]
 
         # 3. Format entries using simple formatting
         log.debug("Formatting all bib entries...")
-        self.all_references.update(format_simple(entries))
+        if entries:
+            self.all_references.update(format_simple(entries, self.preformatted))
+            self.full_bib_cache = None
         log.debug("SUCCESS Formatting all bib entries")
 
-        # 4. Construct quads
+        # 4. Construct quads, formatting each key's footnote and text only once
+        references = {k: self.all_references[k] for k in keys}
         quads = [
-            (
-                cite_block,
-                key,
-                self.format_footnote_key(numbers[key]),
-                self.all_references[key],
-            )
+            (cite_block, key, footnotes[key], references[key])
             for cite_block, key in pairs
         ]
 
         # List the quads in order to remove duplicate entries
         return list(dict.fromkeys(quads))
 
+    def warn_missing_keys(self, keys):
+        """
+        Log a warning for each citation key missing from the bibliography data.
+
+        Each missing key is reported at most once per build.
+
+        Args:
+            keys (iterable): Citation keys to check against the loaded entries.
+        """
+        for key in keys:
+            if key in self.bib_data.entries:
+                continue
+            if key in self.warned_missing_keys:
+                continue
+            log.warning(f"Citation key '{key}' not found in bibliography data")
+            self.warned_missing_keys.add(key)
+
     @property
     def full_bibliography(self):
         """
         Generate the complete bibliography containing all references used in the documentation.
 
+        The rendered text is cached until new references are registered.
+
         Returns:
             str: A formatted string containing all bibliography entries as footnotes,
                 numbered sequentially in the order they were first encountered.
         """
 
+        if self.full_bib_cache is not None:
+            return self.full_bib_cache
+
         bibliography = []
         for number, (key, citation) in enumerate(self.all_references.items(), 1):
             bibliography_text = "[^{}]: {}".format(
@@ -279,4 +368,5 @@ class BibTeXPlugin(BasePlugin):
             )
             bibliography.append(bibliography_text)
 
-        return "\n".join(bibliography) + "\n"
+        self.full_bib_cache = "\n".join(bibliography) + "\n"
+        return self.full_bib_cache
@@ -1,9 +1,22 @@
+import hashlib
 import logging
+import mmap
+import multiprocessing
+import os
+import pickle
 import re
-from collections import OrderedDict
-from itertools import groupby
-
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from importlib import metadata
+from pathlib import Path
+
+import pybtex
+import pybtex.io
 from pybtex.backends.markdown import Backend as MarkdownBackend
+from pybtex.database import parse_string
+from pybtex.exceptions import PybtexError
 from pybtex.style.formatting.plain import Style as PlainStyle
 
 # Grab a logger
@@ -12,31 +25,313 @@ log = logging.getLogger("mkdocs.plugins.mkdocs-bibtex")
 # Matches \cite{author}, \cite[Section 2]{author}, and \cite{author1,author2}
 # Group 1: optional note in square brackets (without brackets)
 # Group 2: one-or-more keys in braces (comma-separated, without braces)
-CITE_BLOCK_RE = re.compile(r"\\cite\b(?:\s*\[([^\[\]]*?)\])?\s*\{([^{}]+)\}")
+# Both groups are greedy negated classes, so matching never backtracks inside a block
+CITE_BLOCK_RE = re.compile(r"\\cite\b(?:\s*\[([^\[\]]*)\])?\s*\{([^{}]+)\}")
+
+# Building a pybtex style costs a few milliseconds, so share one per process
+PLAIN_STYLE = PlainStyle()
+MARKDOWN_BACKEND = MarkdownBackend()
+
+# On-disk cache records are only valid for the versions that produced them
+CACHE_VERSION = (metadata.version("mkdocs-bibtex"), pybtex.__version__)
+
+# Starting worker processes costs up to a second with the spawn start method,
+# about what pybtex takes to parse this much BibTeX serially
+PARALLEL_PARSE_MIN_BYTES = 2 * 1024 * 1024
+
+
+def find_bib_files(bib_dir):
+    """
+    Recursively find BibTeX files and their modification times.
+
+    The tree is walked once with os.scandir, which reuses the file type from
+    the directory listing instead of issuing a separate stat per check.
+    Symlinked directories are not followed, matching Path.rglob.
+
+    Args:
+        bib_dir (str or Path): Directory to search for `.bib` files.
+
+    Returns:
+        dict: Mapping of file paths to modification times in nanoseconds,
+            sorted by path so later files win duplicate keys deterministically.
+    """
+    bib_mtimes = {}
+    pending = [bib_dir]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith(".bib") and entry.is_file():
+                    bib_mtimes[entry.path] = entry.stat().st_mtime_ns
+    return dict(sorted(bib_mtimes.items()))
+
+
+def content_digest(data):
+    """
+    Compute a BLAKE2b digest of file contents.
+
+    Args:
+        data (bytes-like): The contents to hash.
+
+    Returns:
+        str: Hexadecimal digest of the contents.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path):
+    """
+    Compute a BLAKE2b digest of a file's contents.
+
+    The file is hashed through a read-only memory map, so large bibliographies
+    are not copied into a bytes object first.
+
+    Args:
+        path (str or Path): Path to the file.
+
+    Returns:
+        str: Hexadecimal digest of the file contents.
+    """
+    with open(path, "rb") as f:
+        # Zero-length files cannot be mapped
+        if not os.fstat(f.fileno()).st_size:
+            return content_digest(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return content_digest(mapped)
+
+
+def read_pickle_cache(cache_file):
+    """
+    Load a pickled cache record.
+
+    Args:
+        cache_file (Path): Cache file to read.
+
+    Returns:
+        The unpickled record, or None if the file is missing or unreadable.
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def write_pickle_cache(cache_file, record):
+    """
+    Atomically pickle a cache record, logging instead of failing on I/O errors.
+
+    Args:
+        cache_file (Path): Destination cache file.
+        record: The object to store.
+    """
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        log.warning(f"Could not write bibtex cache {cache_file}: {e}")
+
+
+def bib_cache_stamp(bibfile):
+    """
+    Build the cache stamp for a BibTeX file.
+
+    Args:
+        bibfile (str or Path): Path to the BibTeX file.
+
+    Returns:
+        tuple: The file's modification time in nanoseconds, its size, and CACHE_VERSION.
+    """
+    stat = os.stat(bibfile)
+    return (stat.st_mtime_ns, stat.st_size, CACHE_VERSION)
+
 
+def bib_cache_file(bibfile, cache_dir):
+    """
+    Locate the cache file for a BibTeX file.
+
+    Args:
+        bibfile (str or Path): Path to the BibTeX file.
+        cache_dir (str or Path): Directory holding the parse cache.
+
+    Returns:
+        Path: Cache file named after a hash of the resolved source path.
+    """
+    cache_name = hashlib.sha1(str(Path(bibfile).resolve()).encode()).hexdigest()
+    return Path(cache_dir) / f"{cache_name}.pkl"
+
+
+def load_cached_entries(bibfile, cache_dir):
+    """
+    Load the cached entries of a BibTeX file, if the cache is still valid.
+
+    Each source path has one cache file holding its parsed entries and a
+    digest of its contents, stamped with the source's modification time,
+    size, and CACHE_VERSION. A matching stamp is accepted without reading the
+    source; if only the modification time differs, an unchanged digest is
+    accepted too and the stamp is refreshed.
+
+    Args:
+        bibfile (str or Path): Path to the BibTeX file.
+        cache_dir (str or Path): Directory holding the parse cache.
+
+    Returns:
+        dict: The cached entries, or None if the file needs to be parsed.
+    """
+    stamp = bib_cache_stamp(bibfile)
+    cache_file = bib_cache_file(bibfile, cache_dir)
+
+    record = read_pickle_cache(cache_file)
+    if not (isinstance(record, tuple) and len(record) == 3):
+        return None
+
+    cached_stamp, cached_digest, entries = record
+    if cached_stamp == stamp:
+        log.debug(f"Loaded bibtex file {bibfile} from cache")
+        return entries
+    if cached_stamp[1:] == stamp[1:]:
+        # Touched but possibly unmodified, e.g. after a checkout
+        digest = file_digest(bibfile)
+        if cached_digest == digest:
+            log.debug(f"Loaded bibtex file {bibfile} from cache")
+            write_pickle_cache(cache_file, (stamp, digest, entries))
+            return entries
+    return None
+
+
+def parse_bib_entries(bibfile, cache_dir=None):
+    """
+    Parse a single BibTeX file, storing the result in the cache if given.
+
+    The cache stamp is taken before the file is read, and the digest is computed
+    from the same bytes that are parsed, so a save during parsing cannot leave
+    the old entries cached under the new file's stamp.
 
-def format_simple(entries):
+    Args:
+        bibfile (str or Path): Path to the BibTeX file.
+        cache_dir (str or Path, optional): Directory holding the parse cache.
+
+    Returns:
+        dict: Mapping of entry keys to pybtex entries, in file order.
+    """
+    log.debug(f"Parsing bibtex file {bibfile}")
+    stamp = bib_cache_stamp(bibfile) if cache_dir is not None else None
+    with open(bibfile, "rb") as f:
+        data = f.read()
+    try:
+        text = data.decode(pybtex.io.get_default_encoding())
+    except UnicodeDecodeError as e:
+        raise PybtexError(str(e), filename=str(bibfile))
+    entries = dict(parse_string(text, "bibtex").entries.items())
+
+    if cache_dir is not None:
+        record = (stamp, content_digest(data), entries)
+        write_pickle_cache(bib_cache_file(bibfile, cache_dir), record)
+
+    return entries
+
+
+def parse_bib_files(bibfiles, cache_dir=None):
+    """
+    Parse BibTeX files, keeping the entries of each file separate.
+
+    Valid cache entries are loaded in this process. The remaining files are
+    parsed in worker processes when there is more than one and together they
+    reach PARALLEL_PARSE_MIN_BYTES, since pybtex parsing is pure-Python CPU
+    work that threads would serialize on the GIL. Smaller sets are parsed
+    serially, which is faster than starting the workers.
+
+    Workers are started with forkserver where available, otherwise spawn, as
+    forking the threaded `mkdocs serve` process can deadlock the child. If the
+    pool breaks, e.g. in a script without a `__main__` guard, the pending files
+    are parsed serially instead.
+
+    Args:
+        bibfiles (list): Paths to the BibTeX files.
+        cache_dir (str or Path, optional): Directory holding the parse cache.
+
+    Returns:
+        dict: Mapping of each path to its entries, as returned by
+            parse_bib_entries, in the order of `bibfiles`.
+    """
+    entries_by_file = {}
+    if cache_dir is not None:
+        for bibfile in bibfiles:
+            entries_by_file[bibfile] = load_cached_entries(bibfile, cache_dir)
+    pending = [bibfile for bibfile in bibfiles if entries_by_file.get(bibfile) is None]
+
+    parse = partial(parse_bib_entries, cache_dir=cache_dir)
+    pending_bytes = sum(os.path.getsize(bibfile) for bibfile in pending)
+    if len(pending) <= 1 or pending_bytes < PARALLEL_PARSE_MIN_BYTES:
+        results = map(parse, pending)
+    else:
+        max_workers = min(len(pending), os.cpu_count() or 1)
+        start_method = (
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context(start_method)
+            ) as executor:
+                results = list(executor.map(parse, pending))
+        except BrokenProcessPool as e:
+            log.warning(f"Parsing bibtex files in worker processes failed ({e}), parsing serially")
+            results = map(parse, pending)
+    entries_by_file.update(zip(pending, results))
+
+    return {bibfile: entries_by_file[bibfile] for bibfile in bibfiles}
+
+
+def entry_fingerprint(entry):
+    """
+    Compute a digest of the entry content that formatting depends on.
+
+    Args:
+        entry (Entry): A pybtex bibliography entry.
+
+    Returns:
+        str: Hexadecimal digest of the entry type, fields, and persons.
+    """
+    return hashlib.blake2b(repr(entry).encode(), digest_size=16).hexdigest()
+
+
+def format_simple(entries, preformatted=None):
     """
     Format bibliography entries using pybtex's plain style.
 
     Args:
         entries (dict): Dictionary of bibliography entries to format.
+        preformatted (dict, optional): Formatted text keyed by entry_fingerprint.
+            Entries found here are not formatted again, and newly formatted
+            entries are added to it.
 
     Returns:
         dict: Dictionary mapping entry keys to formatted citation text.
     """
-    style = PlainStyle()
-    backend = MarkdownBackend()
-    citations = OrderedDict()
+    citations = {}
     for key, entry in entries.items():
+        if preformatted is not None:
+            fingerprint = entry_fingerprint(entry)
+            if fingerprint in preformatted:
+                citations[key] = preformatted[fingerprint]
+                continue
+
         log.debug(f"Formatting bibtex entry {key!r}")
-        formatted_entry = style.format_entry("", entry)
-        entry_text = formatted_entry.text.render(backend)
+        formatted_entry = PLAIN_STYLE.format_entry("", entry)
+        entry_text = formatted_entry.text.render(MARKDOWN_BACKEND)
         entry_text = entry_text.replace("\n", " ")
-        # Local reference list for this file
-        citations[key] = (
+        entry_text = (
             entry_text.replace("\\(", "(").replace("\\)", ")").replace("\\.", ".")
         )
+        # Unescape doubled backslashes, e.g. in math titles like $\mathcal{O}(n)$,
+        # as a regex replacement template would
+        citations[key] = entry_text.replace("\\\\", "\\")
+        if preformatted is not None:
+            preformatted[fingerprint] = citations[key]
         log.debug(f"SUCCESS Formatting bibtex entry {key!r}")
     return citations
 
@@ -51,12 +346,20 @@ def extract_cite_keys(cite_block):
     Returns:
         list: List of citation keys found in the block.
     """
-    match = CITE_BLOCK_RE.fullmatch(cite_block.strip())
-    if not match:
-        return []
-
-    keys_group = match.group(2)
-    return [tok.strip() for tok in keys_group.split(",") if tok.strip()]
+    if cite_block.startswith("\\cite{") and cite_block.endswith("}"):
+        # Plain \cite{...} without a note: slicing is enough, no regex needed
+        keys_group = cite_block[6:-1]
+        if "{" in keys_group or "}" in keys_group:
+            return []
+    else:
+        match = CITE_BLOCK_RE.fullmatch(cite_block.strip())
+        if not match:
+            return []
+        keys_group = match.group(2)
+
+    # Interned keys let the per-key dicts in format_citations compare by identity
+    keys = [tok.strip() for tok in keys_group.split(",")]
+    return [sys.intern(key) for key in keys if key]
 
 
 def find_cite_blocks(markdown):
@@ -73,6 +376,10 @@ def find_cite_blocks(markdown):
         Matches: \\cite{author}, \\cite[Section 2]{author}, \\cite{author1,author2}
         Does NOT match: \\parencite{author}, [@author]
     """
+    # A plain substring check is much cheaper than the regex on cite-free pages
+    if "\\cite" not in markdown:
+        return []
+
     citation_blocks = [matches.group(0) for matches in CITE_BLOCK_RE.finditer(markdown)]
 
     return citation_blocks
@@ -82,6 +389,9 @@ def insert_citation_keys(citation_quads, markdown):
     """
     Replace citation blocks with generated citation keys in markdown text.
 
+    The markdown is scanned once with CITE_BLOCK_RE, and each matched block is
+    swapped for its footnote references; blocks without quads are left as-is.
+
     Args:
         citation_quads (tuple): Tuple containing citation information.
         markdown (str): The markdown text to modify.
@@ -92,22 +402,23 @@ def insert_citation_keys(citation_quads, markdown):
 
     log.debug("Replacing citation keys with the generated ones...")
 
-    # Renumber quads if using numbers for citation links
+    grouped_quads = {}
+    for quad in citation_quads:
+        grouped_quads.setdefault(quad[0], []).append("[^{}]".format(quad[2]))
+    footnotes = {block: "".join(refs) for block, refs in grouped_quads.items()}
 
-    grouped_quads = [list(g) for _, g in groupby(citation_quads, key=lambda x: x[0])]
-    for quad_group in grouped_quads:
-        full_citation = quad_group[0][0]  # the full citation block
-        replacement_citation = "".join(["[^{}]".format(quad[2]) for quad in quad_group])
+    def replace(match):
+        replacement_citation = footnotes.get(match.group(0))
+        if replacement_citation is None:
+            return match.group(0)
 
-        # Extract suffix from the citation block using the same regex as find_cite_blocks
-        match = CITE_BLOCK_RE.fullmatch(full_citation.strip())
-        suffix = ""
-        if match and match.group(1) and match.group(1).strip():  # group 1 is the optional note
-            suffix = " " + match.group(1).strip()
+        # Group 1 is the optional note, appended after the footnote references
+        note = match.group(1)
+        if note and note.strip():
+            replacement_citation += " " + note.strip()
+        return replacement_citation
 
-        # Add suffix to replacement citation
-        replacement_citation = replacement_citation + suffix
-        markdown = markdown.replace(full_citation, replacement_citation)
+    markdown = CITE_BLOCK_RE.sub(replace, markdown)
 
     log.debug("SUCCESS Replacing citation keys with the generated ones")
 
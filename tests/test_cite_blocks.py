@@ -1,8 +1,4 @@
-import sys
 import unittest
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 from mkdocs_bibtex.utils import extract_cite_keys, find_cite_blocks
 
@@ -28,6 +24,10 @@ class TestCiteBlocks(unittest.TestCase):
         markdown = "[@author]"
         self.assertEqual(find_cite_blocks(markdown), [])
 
+    def test_returns_empty_for_markdown_without_cites(self):
+        self.assertEqual(find_cite_blocks(""), [])
+        self.assertEqual(find_cite_blocks("# Title\n\nPlain text with {braces}."), [])
+
     def test_extract_cite_key_for_simple_cite(self):
         self.assertEqual(extract_cite_keys(r"\cite{author}"), ["author"])
 
@@ -1,22 +1,69 @@
 import os
-import sys
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
-
+from mkdocs_bibtex import utils
 from mkdocs_bibtex.plugin import BibTeXPlugin
 
 
-class DummyConfig(dict):
+class DummyConfig:
+    __slots__ = ("config_file_path",)
+
     def __init__(self, config_file_path: str):
-        super().__init__(config_file_path=config_file_path)
         self.config_file_path = config_file_path
 
+    def __getitem__(self, key):
+        if key != "config_file_path":
+            raise KeyError(key)
+        return self.config_file_path
+
+    def get(self, key, default=None):
+        return self.config_file_path if key == "config_file_path" else default
+
 
 class TestPluginBehavior(unittest.TestCase):
-    def _write_sample_bib(self, path: Path):
+    @classmethod
+    def setUpClass(cls):
+        # Read-only site shared by tests that do not touch the filesystem
+        cls._site = tempfile.TemporaryDirectory()
+        root = Path(cls._site.name)
+        cls.mkdocs_file, cls.bib_dir = cls._write_site(root)
+
+        (root / "docs").mkdir()
+        cls.nested_mkdocs_file = root / "docs" / "mkdocs.yml"
+        cls.nested_mkdocs_file.write_text("site_name: Test\n", encoding="utf-8")
+
+        (cls.bib_dir / "nested").mkdir()
+        (cls.bib_dir / "nested" / "more.bib").write_text(
+            """@book{roe2019,
+  title={Third Title},
+  author={Roe, Richard},
+  publisher={Example Press},
+  year={2019}
+}
+""",
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._site.cleanup()
+
+    @classmethod
+    def _write_site(cls, root: Path):
+        mkdocs_file = root / "mkdocs.yml"
+        mkdocs_file.write_text("site_name: Test\n", encoding="utf-8")
+
+        bib_dir = root / "bibliography"
+        bib_dir.mkdir()
+        cls._write_sample_bib(bib_dir / "refs.bib")
+        return mkdocs_file, bib_dir
+
+    @staticmethod
+    def _write_sample_bib(path: Path):
         path.write_text(
             """@article{smith2020,
   title={Example Title},
@@ -45,47 +92,209 @@ class TestPluginBehavior(unittest.TestCase):
         }
         return plugin
 
+    def _make_site(self):
+        # Private site for tests that add files, touch mtimes, or write caches
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        return self._write_site(Path(tempdir.name))
+
+    def _configured_plugin(self):
+        plugin = self._make_plugin(str(self.bib_dir))
+        config = DummyConfig(str(self.mkdocs_file))
+        plugin.on_config(config)
+        return plugin, config
+
     def test_loads_entries_from_bib_dir(self):
-        with tempfile.TemporaryDirectory() as tempdir:
-            root = Path(tempdir)
-            mkdocs_file = root / "mkdocs.yml"
-            mkdocs_file.write_text("site_name: Test\n", encoding="utf-8")
-
-            bib_dir = root / "bibliography"
-            bib_dir.mkdir()
-            bib_file = bib_dir / "refs.bib"
-            self._write_sample_bib(bib_file)
-
-            plugin = self._make_plugin(str(bib_dir))
-            config = DummyConfig(str(mkdocs_file))
-            plugin.on_config(config)
+        plugin, config = self._configured_plugin()
+
+        self.assertIn("smith2020", plugin.bib_data.entries)
+
+    def test_merges_entries_from_multiple_bib_files(self):
+        plugin, config = self._configured_plugin()
+
+        self.assertIn("smith2020", plugin.bib_data.entries)
+        self.assertIn("roe2019", plugin.bib_data.entries)
 
-            self.assertIn("smith2020", plugin.bib_data.entries)
+    def test_parses_small_bib_files_without_worker_processes(self):
+        with mock.patch("mkdocs_bibtex.utils.ProcessPoolExecutor") as executor:
+            plugin, config = self._configured_plugin()
+
+        executor.assert_not_called()
+        self.assertIn("roe2019", plugin.bib_data.entries)
+
+    def _make_overlapping_site(self):
+        mkdocs_file, bib_dir = self._make_site()
+        (bib_dir / "zz.bib").write_text(
+            "@misc{doe2021,\n  title={Later Title}\n}\n@misc{roe2019,\n  title={Third Title}\n}\n",
+            encoding="utf-8",
+        )
+        return mkdocs_file, bib_dir
+
+    def test_parses_bib_files_in_worker_processes(self):
+        for cache_dir in (None, ".cache"):
+            with self.subTest(cache_dir=cache_dir):
+                mkdocs_file, bib_dir = self._make_overlapping_site()
+                plugin = self._make_plugin(str(bib_dir))
+                plugin.config["cache_dir"] = cache_dir
+                with mock.patch("mkdocs_bibtex.utils.PARALLEL_PARSE_MIN_BYTES", 0):
+                    plugin.on_config(DummyConfig(str(mkdocs_file)))
+
+                entries = plugin.bib_data.entries
+                self.assertIn("smith2020", entries)
+                self.assertIn("roe2019", entries)
+                # The later file wins duplicate keys
+                self.assertEqual(entries["doe2021"].fields["title"], "Later Title")
+                cache_files = list((mkdocs_file.parent / ".cache").glob("*.pkl"))
+                self.assertEqual(len(cache_files), 2 if cache_dir else 0)
+
+    def test_broken_worker_pool_falls_back_to_serial_parsing(self):
+        mkdocs_file, bib_dir = self._make_overlapping_site()
+        plugin = self._make_plugin(str(bib_dir))
+        with mock.patch("mkdocs_bibtex.utils.PARALLEL_PARSE_MIN_BYTES", 0), mock.patch(
+            "mkdocs_bibtex.utils.ProcessPoolExecutor"
+        ) as executor:
+            executor.return_value.__enter__.return_value.map.side_effect = (
+                utils.BrokenProcessPool("worker died")
+            )
+            with self.assertLogs("mkdocs.plugins.mkdocs-bibtex", level="WARNING") as logs:
+                plugin.on_config(DummyConfig(str(mkdocs_file)))
+
+        self.assertTrue(any("parsing serially" in line for line in logs.output))
+        self.assertIn("smith2020", plugin.bib_data.entries)
+        self.assertEqual(plugin.bib_data.entries["doe2021"].fields["title"], "Later Title")
 
     def test_resolves_relative_bib_dir_from_mkdocs_config_dir(self):
-        with tempfile.TemporaryDirectory() as tempdir:
-            root = Path(tempdir)
-            docs_dir = root / "docs"
-            docs_dir.mkdir()
-            mkdocs_file = docs_dir / "mkdocs.yml"
-            mkdocs_file.write_text("site_name: Test\n", encoding="utf-8")
-
-            bib_dir = root / "bibliography"
-            bib_dir.mkdir()
-            bib_file = bib_dir / "refs.bib"
-            self._write_sample_bib(bib_file)
-
-            plugin = self._make_plugin("../bibliography")
-            config = DummyConfig(str(mkdocs_file))
-
-            old_cwd = os.getcwd()
-            try:
-                os.chdir("/")
-                plugin.on_config(config)
-            finally:
-                os.chdir(old_cwd)
-
-            self.assertIn("smith2020", plugin.bib_data.entries)
+        plugin = self._make_plugin("../bibliography")
+        config = DummyConfig(str(self.nested_mkdocs_file))
+
+        old_cwd = os.getcwd()
+        try:
+            os.chdir("/")
+            plugin.on_config(config)
+        finally:
+            os.chdir(old_cwd)
+
+        self.assertIn("smith2020", plugin.bib_data.entries)
+
+    def test_reloads_only_when_bib_files_change(self):
+        mkdocs_file, bib_dir = self._make_site()
+
+        plugin = self._make_plugin(str(bib_dir))
+        config = DummyConfig(str(mkdocs_file))
+        plugin.on_config(config)
+        bib_data = plugin.bib_data
+
+        plugin.on_config(config)
+        self.assertIs(plugin.bib_data, bib_data)
+
+        (bib_dir / "extra.bib").write_text(
+            "@misc{roe2019,\n  title={Third Title},\n  year={2019}\n}\n",
+            encoding="utf-8",
+        )
+        plugin.format_citations([r"\cite{smith2020}"])
+        smith_entry = plugin.bib_data.entries["smith2020"]
+
+        plugin.on_config(config)
+        self.assertIsNot(plugin.bib_data, bib_data)
+        self.assertIn("roe2019", plugin.bib_data.entries)
+        # Unchanged files keep their parsed entries and formatted text
+        self.assertIs(plugin.bib_data.entries["smith2020"], smith_entry)
+        self.assertEqual(plugin.all_references, {})
+        with mock.patch("mkdocs_bibtex.utils.PLAIN_STYLE") as style:
+            plugin.format_citations([r"\cite{smith2020}"])
+        style.format_entry.assert_not_called()
+
+    def test_reconfig_numbers_full_bibliography_like_a_fresh_build(self):
+        mkdocs_file, bib_dir = self._make_site()
+        config = DummyConfig(str(mkdocs_file))
+        bib_file = bib_dir / "extra.bib"
+        bib_file.write_text("@misc{roe2019,\n  title={Third Title}\n}\n", encoding="utf-8")
+        markdown = "Cite \\cite{roe2019} and \\cite{smith2020}.\n\n\\full_bibliography"
+
+        plugin = self._make_plugin(str(bib_dir))
+        plugin.on_config(config)
+        plugin.on_page_markdown(markdown, page=None, config=config, files=None)
+
+        bib_file.write_text("@misc{roe2019,\n  title={Edited Title}\n}\n", encoding="utf-8")
+        stat = bib_file.stat()
+        os.utime(bib_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        plugin.on_config(config)
+        rebuilt = plugin.on_page_markdown(markdown, page=None, config=config, files=None)
+
+        fresh = self._make_plugin(str(bib_dir))
+        fresh.on_config(config)
+        self.assertEqual(
+            rebuilt, fresh.on_page_markdown(markdown, page=None, config=config, files=None)
+        )
+
+    def test_reuses_parse_cache_across_plugin_instances(self):
+        mkdocs_file, bib_dir = self._make_site()
+        bib_file = bib_dir / "refs.bib"
+
+        config = DummyConfig(str(mkdocs_file))
+        plugin = self._make_plugin(str(bib_dir))
+        plugin.config["cache_dir"] = ".cache"
+        plugin.on_config(config)
+        self.assertEqual(len(list((mkdocs_file.parent / ".cache").glob("*.pkl"))), 1)
+
+        plugin = self._make_plugin(str(bib_dir))
+        plugin.config["cache_dir"] = ".cache"
+        with mock.patch("mkdocs_bibtex.utils.parse_string") as parse_string:
+            plugin.on_config(config)
+
+        parse_string.assert_not_called()
+        self.assertIn("smith2020", plugin.bib_data.entries)
+
+        # A touched but unmodified file is recognised by its content digest
+        stat = bib_file.stat()
+        os.utime(bib_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        plugin = self._make_plugin(str(bib_dir))
+        plugin.config["cache_dir"] = ".cache"
+        with mock.patch("mkdocs_bibtex.utils.parse_string") as parse_string:
+            plugin.on_config(config)
+
+        parse_string.assert_not_called()
+        self.assertIn("smith2020", plugin.bib_data.entries)
+
+    def test_parse_cache_ignores_saves_during_parsing(self):
+        mkdocs_file, bib_dir = self._make_site()
+        bib_file = bib_dir / "extra.bib"
+        cache_dir = mkdocs_file.parent / ".cache"
+        bib_file.write_text("@misc{old,\n  year={2019}\n}\n", encoding="utf-8")
+        stat = bib_file.stat()
+
+        def save_while_parsing(*args, **kwargs):
+            # Same size, later modification time
+            bib_file.write_text("@misc{new,\n  year={2019}\n}\n", encoding="utf-8")
+            os.utime(bib_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            return parse_string(*args, **kwargs)
+
+        parse_string = utils.parse_string
+        with mock.patch("mkdocs_bibtex.utils.parse_string", side_effect=save_while_parsing):
+            entries = utils.parse_bib_entries(str(bib_file), cache_dir=cache_dir)
+
+        self.assertEqual(list(entries), ["old"])
+        self.assertIsNone(utils.load_cached_entries(str(bib_file), cache_dir))
+
+    def test_reuses_formatted_references_from_cache_dir(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+
+        config = DummyConfig(str(self.mkdocs_file))
+        plugin = self._make_plugin(str(self.bib_dir))
+        plugin.config["cache_dir"] = cache_dir.name
+        plugin.on_config(config)
+        first = plugin.format_citations([r"\cite{smith2020}"])
+        plugin.on_post_build(config)
+
+        plugin = self._make_plugin(str(self.bib_dir))
+        plugin.config["cache_dir"] = cache_dir.name
+        plugin.on_config(config)
+        with mock.patch("mkdocs_bibtex.utils.PLAIN_STYLE") as style:
+            second = plugin.format_citations([r"\cite{smith2020}"])
+
+        style.format_entry.assert_not_called()
+        self.assertEqual(second, first)
 
     def test_requires_bib_dir(self):
         plugin = BibTeXPlugin()
@@ -103,103 +312,121 @@ class TestPluginBehavior(unittest.TestCase):
         self.assertIn("bib_dir", str(exc_info.exception))
 
     def test_warns_unknown_key_once_per_build(self):
-        with tempfile.TemporaryDirectory() as tempdir:
-            root = Path(tempdir)
-            mkdocs_file = root / "mkdocs.yml"
-            mkdocs_file.write_text("site_name: Test\n", encoding="utf-8")
-
-            bib_dir = root / "bibliography"
-            bib_dir.mkdir()
-            bib_file = bib_dir / "refs.bib"
-            self._write_sample_bib(bib_file)
-
-            plugin = self._make_plugin(str(bib_dir))
-            config = DummyConfig(str(mkdocs_file))
-            plugin.on_config(config)
+        plugin, config = self._configured_plugin()
 
-            with self.assertLogs("mkdocs.plugins.mkdocs-bibtex", level="WARNING") as logs:
-                plugin.format_citations([r"\cite{missing}"])
-                plugin.format_citations([r"\cite[p. 2]{missing}"])
+        with self.assertLogs("mkdocs.plugins.mkdocs-bibtex", level="WARNING") as logs:
+            plugin.format_citations([r"\cite{missing}"])
+            plugin.format_citations([r"\cite[p. 2]{missing}"])
 
-            first_build_warnings = [
-                line for line in logs.output if "Citation key 'missing' not found" in line
-            ]
-            self.assertEqual(len(first_build_warnings), 1)
+        first_build_warnings = [
+            line for line in logs.output if "Citation key 'missing' not found" in line
+        ]
+        self.assertEqual(len(first_build_warnings), 1)
 
-            plugin.on_config(config)
-            with self.assertLogs("mkdocs.plugins.mkdocs-bibtex", level="WARNING") as logs2:
-                plugin.format_citations([r"\cite{missing}"])
+        plugin.on_config(config)
+        with self.assertLogs("mkdocs.plugins.mkdocs-bibtex", level="WARNING") as logs2:
+            plugin.format_citations([r"\cite{missing}"])
 
-            second_build_warnings = [
-                line for line in logs2.output if "Citation key 'missing' not found" in line
-            ]
-            self.assertEqual(len(second_build_warnings), 1)
+        second_build_warnings = [
+            line for line in logs2.output if "Citation key 'missing' not found" in line
+        ]
+        self.assertEqual(len(second_build_warnings), 1)
 
     def test_formats_multi_key_latex_cite_blocks(self):
-        with tempfile.TemporaryDirectory() as tempdir:
-            root = Path(tempdir)
-            mkdocs_file = root / "mkdocs.yml"
-            mkdocs_file.write_text("site_name: Test\n", encoding="utf-8")
-
-            bib_dir = root / "bibliography"
-            bib_dir.mkdir()
-            bib_file = bib_dir / "refs.bib"
-            self._write_sample_bib(bib_file)
-
-            plugin = self._make_plugin(str(bib_dir))
-            config = DummyConfig(str(mkdocs_file))
-            plugin.on_config(config)
+        plugin, config = self._configured_plugin()
 
-            quads = plugin.format_citations([r"\cite{smith2020,doe2021}"])
-            self.assertEqual(len(quads), 2)
-            self.assertEqual([q[1] for q in quads], ["smith2020", "doe2021"])
-            self.assertEqual([q[2] for q in quads], ["1", "2"])
+        quads = plugin.format_citations([r"\cite{smith2020,doe2021}"])
+        self.assertEqual(len(quads), 2)
+        self.assertEqual([q[1] for q in quads], ["smith2020", "doe2021"])
+        self.assertEqual([q[2] for q in quads], ["1", "2"])
+
+        repeated = plugin.format_citations(
+            [r"\cite{doe2021}", r"\cite{smith2020}", r"\cite{doe2021}"]
+        )
+        self.assertEqual([q[1] for q in repeated], ["doe2021", "smith2020"])
+        self.assertEqual([q[2] for q in repeated], ["1", "2"])
 
     def test_on_page_markdown_replaces_latex_cites_and_note(self):
-        with tempfile.TemporaryDirectory() as tempdir:
-            root = Path(tempdir)
-            mkdocs_file = root / "mkdocs.yml"
-            mkdocs_file.write_text("site_name: Test\n", encoding="utf-8")
-
-            bib_dir = root / "bibliography"
-            bib_dir.mkdir()
-            bib_file = bib_dir / "refs.bib"
-            self._write_sample_bib(bib_file)
-
-            plugin = self._make_plugin(str(bib_dir))
-            config = DummyConfig(str(mkdocs_file))
-            plugin.on_config(config)
+        plugin, config = self._configured_plugin()
 
-            markdown = (
-                r"First cite \cite[Section 4]{smith2020}. "
-                r"Then multi \cite{smith2020,doe2021}."
-            )
+        markdown = (
+            r"First cite \cite[Section 4]{smith2020}. "
+            r"Then multi \cite{smith2020,doe2021}."
+        )
+        rendered = plugin.on_page_markdown(markdown, page=None, config=config, files=None)
+
+        self.assertIn("[^1] Section 4", rendered)
+        self.assertIn("[^1][^2]", rendered)
+        self.assertIn("[^1]:", rendered)
+        self.assertIn("[^2]:", rendered)
+
+    def test_math_titles_keep_single_backslashes(self):
+        mkdocs_file, bib_dir = self._make_site()
+        (bib_dir / "math.bib").write_text(
+            "@misc{knuth1997,\n  title={Sorting in $\\mathcal{O}(n)$ time},\n  year={1997}\n}\n",
+            encoding="utf-8",
+        )
+        plugin = self._make_plugin(str(bib_dir))
+        config = DummyConfig(str(mkdocs_file))
+        plugin.on_config(config)
+
+        markdown = "Cite \\cite{knuth1997}.\n\n\\full_bibliography"
+        rendered = plugin.on_page_markdown(markdown, page=None, config=config, files=None)
+
+        self.assertEqual(rendered.count("$\\mathcal O(n)$"), 2)
+        self.assertNotIn("\\\\", rendered)
+
+    def test_full_bibliography_tracks_new_references(self):
+        plugin, config = self._configured_plugin()
+
+        plugin.format_citations([r"\cite{smith2020}"])
+        first = plugin.full_bibliography
+        self.assertIs(plugin.full_bibliography, first)
+        self.assertNotIn("[^2]:", first)
+
+        plugin.format_citations([r"\cite{doe2021}"])
+        self.assertIn("[^2]:", plugin.full_bibliography)
+
+    def test_on_page_markdown_reuses_cached_page(self):
+        plugin, config = self._configured_plugin()
+
+        page = SimpleNamespace(file=SimpleNamespace(src_path="index.md"))
+        markdown = r"Cite \cite{smith2020} and \cite{missing}."
+        first = plugin.on_page_markdown(markdown, page=page, config=config, files=None)
+
+        plugin.on_config(config)
+        with mock.patch.object(plugin, "format_citations") as format_citations:
+            with self.assertLogs("mkdocs.plugins.mkdocs-bibtex", level="WARNING") as logs:
+                second = plugin.on_page_markdown(
+                    markdown, page=page, config=config, files=None
+                )
+
+        format_citations.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertTrue(any("'missing' not found" in line for line in logs.output))
+
+        edited = plugin.on_page_markdown(
+            markdown + r" \cite{doe2021}", page=page, config=config, files=None
+        )
+        self.assertIn("[^2]:", edited)
+
+    def test_page_without_citations_is_returned_unchanged(self):
+        plugin, config = self._configured_plugin()
+
+        markdown = "# Title\n\nNo citations here."
+        with mock.patch.object(plugin, "format_citations") as format_citations:
             rendered = plugin.on_page_markdown(markdown, page=None, config=config, files=None)
 
-            self.assertIn("[^1] Section 4", rendered)
-            self.assertIn("[^1][^2]", rendered)
-            self.assertIn("[^1]:", rendered)
-            self.assertIn("[^2]:", rendered)
+        format_citations.assert_not_called()
+        self.assertEqual(rendered, markdown)
 
     def test_legacy_pandoc_syntax_is_not_processed(self):
-        with tempfile.TemporaryDirectory() as tempdir:
-            root = Path(tempdir)
-            mkdocs_file = root / "mkdocs.yml"
-            mkdocs_file.write_text("site_name: Test\n", encoding="utf-8")
-
-            bib_dir = root / "bibliography"
-            bib_dir.mkdir()
-            bib_file = bib_dir / "refs.bib"
-            self._write_sample_bib(bib_file)
-
-            plugin = self._make_plugin(str(bib_dir))
-            plugin.config["bib_by_default"] = False
-            config = DummyConfig(str(mkdocs_file))
-            plugin.on_config(config)
+        plugin, config = self._configured_plugin()
+        plugin.config["bib_by_default"] = False
 
-            markdown = "Legacy [@smith2020] cite"
-            rendered = plugin.on_page_markdown(markdown, page=None, config=config, files=None)
-            self.assertEqual(rendered, markdown)
+        markdown = "Legacy [@smith2020] cite"
+        rendered = plugin.on_page_markdown(markdown, page=None, config=config, files=None)
+        self.assertEqual(rendered, markdown)
 
 
 if __name__ == "__main__":